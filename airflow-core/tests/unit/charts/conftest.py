@@ -16,10 +16,167 @@
 # under the License.
 from __future__ import annotations
 
+import hashlib
+import inspect
+import os
+import shutil
+from fcntl import LOCK_EX, LOCK_UN, flock
+from pathlib import Path
+
 import pytest
+import yaml
+
+# When set, tests that passed last time and whose inputs did not change since are skipped
+SKIP_UNCHANGED_ENV = "AIRFLOW_CHART_TESTS_SKIP_UNCHANGED"
+PASSED_INPUTS_CACHE_KEY = "helm/passed"
+# Hooks in this conftest see every test of the session, only the chart tests below are handled
+CHART_TESTS_DIR = Path(__file__).resolve().parent
+
+_input_hash_key = pytest.StashKey[str]()
+# Input hashes of the tests run by this process, an empty hash marks a failed test
+_passed_inputs_key = pytest.StashKey[dict[str, str]]()
 
 
 @pytest.fixture(autouse=True, scope="session")
 def initialize_airflow_tests(request):
     # Skip airflow tests initialization for all Helm tests
     return
+
+
+def _chart_dependencies(chart_dir):
+    chart_lock = yaml.safe_load((chart_dir / "Chart.lock").read_text())
+    return chart_lock.get("dependencies") or []
+
+
+def _chart_dependencies_present(chart_dir):
+    return all(
+        (chart_dir / "charts" / f"{dep['name']}-{dep['version']}.tgz").exists()
+        or (chart_dir / "charts" / dep["name"]).is_dir()
+        for dep in _chart_dependencies(chart_dir)
+    )
+
+
+@pytest.fixture(autouse=True, scope="session")
+def built_chart_dir(tmp_path_factory):
+    """
+    Build the chart dependencies once per test session, so helm does not resolve them for each render.
+
+    When the chart in the repository already has its dependencies, it is used as is. Otherwise the
+    dependencies are downloaded, using a helm repository config private to the session, so the user's
+    helm repositories are left untouched.
+    """
+    from chart_utils.helm_template_generator import CHART_BUILT_DIR_ENV, CHART_DIR, run_helm
+
+    if _chart_dependencies_present(CHART_DIR):
+        yield CHART_DIR
+        return
+
+    # Every xdist worker gets its own basetemp, their parent is shared by the whole run
+    root = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        root = root.parent
+    built_dir = root / "chart"
+    built_marker = root / "chart.built"
+    with open(root / "chart.lock", "w") as lock_file:
+        flock(lock_file, LOCK_EX)
+        try:
+            if not built_marker.exists():
+                shutil.rmtree(built_dir, ignore_errors=True)
+                shutil.copytree(CHART_DIR, built_dir)
+                repository_args = (
+                    "--repository-config",
+                    str(root / "helm-repositories.yaml"),
+                    "--repository-cache",
+                    str(root / "helm-repository-cache"),
+                )
+                for dep in _chart_dependencies(built_dir):
+                    run_helm("repo", "add", dep["name"], dep["repository"], *repository_args)
+                run_helm("dependency", "build", str(built_dir), *repository_args)
+                built_marker.touch()
+        finally:
+            flock(lock_file, LOCK_UN)
+
+    os.environ[CHART_BUILT_DIR_ENV] = str(built_dir)
+    yield built_dir
+    os.environ.pop(CHART_BUILT_DIR_ENV, None)
+
+
+def _is_chart_test(path: Path) -> bool:
+    return path.resolve().is_relative_to(CHART_TESTS_DIR)
+
+
+def _test_input_hash(item: pytest.Function, chart_fingerprint: str) -> str:
+    """
+    Hash of what a chart test depends on: the chart, the test sources and the parametrize values.
+
+    Only the test module, the module defining the test function, helm_template_generator and this
+    conftest are hashed. Changes to fixtures or helpers defined in other modules are not detected, so
+    clear the pytest cache (--cache-clear) after changing those.
+    """
+    from chart_utils import helm_template_generator
+
+    input_hash = hashlib.sha256(chart_fingerprint.encode())
+    source_files = {
+        str(item.path),
+        inspect.getsourcefile(item.function),
+        inspect.getsourcefile(helm_template_generator),
+        __file__,
+    }
+    for source_file in sorted(filter(None, source_files)):
+        input_hash.update(Path(source_file).read_bytes())
+    callspec = getattr(item, "callspec", None)
+    if callspec:
+        input_hash.update(repr(sorted(callspec.params.items())).encode())
+    return input_hash.hexdigest()
+
+
+def pytest_collection_modifyitems(config, items):
+    # The cache is missing when the cacheprovider plugin is disabled
+    cache = getattr(config, "cache", None)
+    if not os.environ.get(SKIP_UNCHANGED_ENV) or cache is None:
+        return
+    chart_items = [item for item in items if isinstance(item, pytest.Function) and _is_chart_test(item.path)]
+    if not chart_items:
+        return
+    from chart_utils.helm_template_generator import CHART_DIR, get_chart_fingerprint
+
+    passed_inputs = cache.get(PASSED_INPUTS_CACHE_KEY, {})
+    chart_fingerprint = get_chart_fingerprint(str(CHART_DIR))
+    for item in chart_items:
+        input_hash = _test_input_hash(item, chart_fingerprint)
+        item.stash[_input_hash_key] = input_hash
+        if passed_inputs.get(item.nodeid) == input_hash:
+            item.add_marker(pytest.mark.skip(reason="unchanged since last pass"))
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    input_hash = item.stash.get(_input_hash_key, None)
+    if input_hash is not None:
+        passed_inputs = item.config.stash.setdefault(_passed_inputs_key, {})
+        if report.failed:
+            passed_inputs[item.nodeid] = ""
+        elif report.when == "call" and report.passed:
+            passed_inputs[item.nodeid] = input_hash
+    return report
+
+
+def pytest_sessionfinish(session):
+    cache = getattr(session.config, "cache", None)
+    passed_inputs = session.config.stash.get(_passed_inputs_key, None)
+    if not passed_inputs or cache is None:
+        return
+    # This conftest is loaded by each process that runs tests, which under xdist means every worker but
+    # not the controller, so each of them merges its own results into the cache under a lock
+    with open(cache.mkdir("helm") / "passed.lock", "w") as lock_file:
+        flock(lock_file, LOCK_EX)
+        try:
+            merged_inputs = cache.get(PASSED_INPUTS_CACHE_KEY, {})
+            merged_inputs.update(passed_inputs)
+            cache.set(
+                PASSED_INPUTS_CACHE_KEY,
+                {nodeid: input_hash for nodeid, input_hash in merged_inputs.items() if input_hash},
+            )
+        finally:
+            flock(lock_file, LOCK_UN)
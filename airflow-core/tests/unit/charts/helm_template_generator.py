@@ -16,7 +16,10 @@
 # under the License.
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
+import os
 import subprocess
 from functools import cache
 from io import StringIO
@@ -24,15 +27,25 @@ from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Any
 
-import jmespath
 import jsonschema
 import requests
 import yaml
 from kubernetes.client.api_client import ApiClient
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore[assignment, no-redef]
+
 api_client = ApiClient()
 
 CHART_DIR = Path(__file__).resolve().parents[4] / "chart"
+# Points to a copy of the chart with its dependencies already built, set by the chart tests conftest
+CHART_BUILT_DIR_ENV = "AIRFLOW_CHART_BUILT_DIR"
+# When set, rendered charts are stored in (and read back from) this directory, keyed by the chart content.
+# Every chart change starts a new fingerprint subdirectory and old ones are never removed, so the
+# directory is meant to be a disposable cache (e.g. a CI cache) that is cleared from time to time.
+CHART_SNAPSHOT_DIR_ENV = "AIRFLOW_CHART_SNAPSHOT_DIR"
 
 DEFAULT_KUBERNETES_VERSION = "1.29.1"
 BASE_URL_SPEC = (
@@ -46,6 +59,9 @@ crd_lookup = {
     "networking.k8s.io/v1beta1::Ingress": "https://raw.githubusercontent.com/yannh/kubernetes-json-schema/master/v1.21.0/ingress-networking-v1beta1.json",
 }
 
+# Rendered (and already validated) k8s objects keyed by a hash of the render_chart inputs
+_rendered_chart_cache: dict[str, list[dict[str, Any]]] = {}
+
 
 @cache
 def get_schema_k8s(api_version, kind, kubernetes_version):
@@ -74,7 +90,7 @@ def get_schema_crd(api_version, kind):
         return None
     response = requests.get(url)
     yaml_schema = response.content.decode("utf-8")
-    schema = yaml.safe_load(StringIO(yaml_schema))
+    schema = yaml.load(StringIO(yaml_schema), Loader=SafeLoader)
     return schema
 
 
@@ -90,7 +106,7 @@ def create_validator(api_version, kind, kubernetes_version):
 
 def validate_k8s_object(instance, kubernetes_version):
     # Skip PostgreSQL chart
-    labels = jmespath.search("metadata.labels", instance)
+    labels = instance["metadata"]["labels"]
     if "helm.sh/chart" in labels:
         chart = labels["helm.sh/chart"]
     else:
@@ -108,6 +124,14 @@ class HelmFailedError(subprocess.CalledProcessError):
         return f"Helm command failed. Args: {self.args}\nStderr: \n{self.stderr.decode('utf-8')}"
 
 
+def run_helm(*args, cwd=None) -> bytes:
+    """Run a helm command and return its stdout, raising HelmFailedError when it fails."""
+    result = subprocess.run(["helm", *args], capture_output=True, cwd=cwd)
+    if result.returncode:
+        raise HelmFailedError(result.returncode, result.args, result.stdout, result.stderr)
+    return result.stdout
+
+
 def render_chart(
     name="release-name",
     values=None,
@@ -118,16 +142,90 @@ def render_chart(
 ):
     """
     Function that renders a helm chart into dictionaries. For helm chart testing only
+
+    Rendered objects are cached per unique set of inputs, so repeated renders with the same values
+    do not invoke helm again. A deep copy is returned, so callers are free to mutate the result.
+    When AIRFLOW_CHART_SNAPSHOT_DIR is set, renders are also kept on disk for as long as the chart
+    files and the helm version stay the same.
     """
     values = values or {}
-    chart_dir = chart_dir or str(CHART_DIR)
+    show_only = tuple(show_only or ())
+    chart_dir = chart_dir or os.environ.get(CHART_BUILT_DIR_ENV) or str(CHART_DIR)
     namespace = namespace or "default"
+    cache_key = _render_cache_key(name, values, show_only, chart_dir, kubernetes_version, namespace)
+    if cache_key not in _rendered_chart_cache:
+        _rendered_chart_cache[cache_key] = _render_chart_with_snapshot(
+            name, values, show_only, chart_dir, kubernetes_version, namespace
+        )
+    return copy.deepcopy(_rendered_chart_cache[cache_key])
+
+
+def _render_cache_key(name, values, show_only, chart_dir, kubernetes_version, namespace) -> str:
+    # The order of show_only is kept, as helm emits the documents in that order
+    payload = json.dumps(
+        [name, values, list(show_only), str(chart_dir), kubernetes_version, namespace],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _render_chart_with_snapshot(name, values, show_only, chart_dir, kubernetes_version, namespace):
+    snapshot_dir = os.environ.get(CHART_SNAPSHOT_DIR_ENV)
+    if not snapshot_dir:
+        return _render_chart(name, values, show_only, chart_dir, kubernetes_version, namespace)
+    # The chart location is replaced by its fingerprint, so snapshots of a built chart copy living in
+    # a per-session temporary directory are still found by later sessions
+    fingerprint = get_chart_fingerprint(str(chart_dir))
+    snapshot_key = _render_cache_key(name, values, show_only, fingerprint, kubernetes_version, namespace)
+    snapshot = Path(snapshot_dir) / fingerprint / f"{snapshot_key}.json"
+    if snapshot.exists():
+        return json.loads(snapshot.read_bytes())
+    k8s_objects = _render_chart(name, values, show_only, chart_dir, kubernetes_version, namespace)
+    # Snapshots are stored as JSON, which loads much faster than YAML. Objects that do not survive the
+    # round trip unchanged (e.g. YAML timestamps or non-string keys) are simply not snapshotted.
+    try:
+        content = json.dumps(k8s_objects)
+    except TypeError:
+        return k8s_objects
+    if json.loads(content) != k8s_objects:
+        return k8s_objects
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so concurrent test workers never read a partial snapshot
+    with NamedTemporaryFile("w", dir=snapshot.parent, suffix=".tmp", delete=False) as tmp_file:
+        tmp_file.write(content)
+    os.replace(tmp_file.name, snapshot)
+    return k8s_objects
+
+
+@cache
+def get_chart_fingerprint(chart_dir: str) -> str:
+    """
+    Hash of the chart files, the helm version and this module, so snapshots are invalidated by any change.
+
+    This module is included because it renders, parses and validates what ends up in a snapshot, and
+    defines the snapshot format.
+    """
+    fingerprint = hashlib.sha256(run_helm("version", "--short"))
+    fingerprint.update(Path(__file__).read_bytes())
+    for path in sorted(Path(chart_dir).rglob("*")):
+        if path.is_file():
+            fingerprint.update(str(path.relative_to(chart_dir)).encode())
+            fingerprint.update(path.read_bytes())
+    return fingerprint.hexdigest()
+
+
+def _render_chart(name, values, show_only, chart_dir, kubernetes_version, namespace):
+    templates = _run_helm_template(name, values, show_only, chart_dir, kubernetes_version, namespace)
+    return _load_k8s_objects(templates, kubernetes_version)
+
+
+def _run_helm_template(name, values, show_only, chart_dir, kubernetes_version, namespace) -> bytes:
     with NamedTemporaryFile() as tmp_file:
         content = yaml.dump(values)
         tmp_file.write(content.encode())
         tmp_file.flush()
         command = [
-            "helm",
             "template",
             name,
             chart_dir,
@@ -141,15 +239,15 @@ def render_chart(
         if show_only:
             for i in show_only:
                 command.extend(["--show-only", i])
-        result = subprocess.run(command, capture_output=True, cwd=chart_dir)
-        if result.returncode:
-            raise HelmFailedError(result.returncode, result.args, result.stdout, result.stderr)
-        templates = result.stdout
-        k8s_objects = yaml.full_load_all(templates)
-        k8s_objects = [k8s_object for k8s_object in k8s_objects if k8s_object]  # type: ignore
-        for k8s_object in k8s_objects:
-            validate_k8s_object(k8s_object, kubernetes_version)
-        return k8s_objects
+        return run_helm(*command, cwd=chart_dir)
+
+
+def _load_k8s_objects(templates, kubernetes_version):
+    k8s_objects = yaml.load_all(templates, Loader=SafeLoader)
+    k8s_objects = [k8s_object for k8s_object in k8s_objects if k8s_object]  # type: ignore
+    for k8s_object in k8s_objects:
+        validate_k8s_object(k8s_object, kubernetes_version)
+    return k8s_objects
 
 
 def prepare_k8s_lookup_dict(k8s_objects) -> dict[tuple[str, str], dict[str, Any]]:
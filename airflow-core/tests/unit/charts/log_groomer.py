@@ -16,28 +16,35 @@
 # under the License.
 from __future__ import annotations
 
-import jmespath
 import pytest
 from chart_utils.helm_template_generator import render_chart
+from jmespath import search as _search
 
 
 class LogGroomerTestBase:
     obj_name: str = ""
     folder: str = ""
 
-    def test_log_groomer_collector_default_enabled(self):
+    @property
+    def deployment_template(self) -> tuple[str, ...]:
+        return (f"templates/{self.folder}/{self.obj_name}-deployment.yaml",)
+
+    @pytest.fixture
+    def default_deployment_docs(self):
+        # Function scoped on purpose: render_chart caches the render and hands each test its own copy
         if self.obj_name == "dag-processor":
             values = {"dagProcessor": {"enabled": True}}
         else:
             values = None
 
-        docs = render_chart(
-            values=values, show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"]
-        )
+        return render_chart(values=values, show_only=self.deployment_template)
+
+    def test_log_groomer_collector_default_enabled(self, default_deployment_docs):
+        docs = default_deployment_docs
 
-        assert len(jmespath.search("spec.template.spec.containers", docs[0])) == 2
+        assert len(docs[0]["spec"]["template"]["spec"]["containers"]) == 2
         assert f"{self.obj_name}-log-groomer" in [
-            c["name"] for c in jmespath.search("spec.template.spec.containers", docs[0])
+            c["name"] for c in docs[0]["spec"]["template"]["spec"]["containers"]
         ]
 
     def test_log_groomer_collector_can_be_disabled(self):
@@ -53,41 +60,27 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
-        actual = jmespath.search("spec.template.spec.containers", docs[0])
+        actual = docs[0]["spec"]["template"]["spec"]["containers"]
 
         assert len(actual) == 1
 
-    def test_log_groomer_collector_default_command_and_args(self):
-        if self.obj_name == "dag-processor":
-            values = {"dagProcessor": {"enabled": True}}
-        else:
-            values = None
+    def test_log_groomer_collector_default_command_and_args(self, default_deployment_docs):
+        docs = default_deployment_docs
 
-        docs = render_chart(
-            values=values, show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"]
-        )
+        assert _search("spec.template.spec.containers[1].command", docs[0]) is None
+        assert docs[0]["spec"]["template"]["spec"]["containers"][1]["args"] == ["bash", "/clean-logs"]
 
-        assert jmespath.search("spec.template.spec.containers[1].command", docs[0]) is None
-        assert jmespath.search("spec.template.spec.containers[1].args", docs[0]) == ["bash", "/clean-logs"]
-
-    def test_log_groomer_collector_default_retention_days(self):
-        if self.obj_name == "dag-processor":
-            values = {"dagProcessor": {"enabled": True}}
-        else:
-            values = None
-
-        docs = render_chart(
-            values=values, show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"]
-        )
+    def test_log_groomer_collector_default_retention_days(self, default_deployment_docs):
+        docs = default_deployment_docs
 
         assert (
-            jmespath.search("spec.template.spec.containers[1].env[0].name", docs[0])
+            docs[0]["spec"]["template"]["spec"]["containers"][1]["env"][0]["name"]
             == "AIRFLOW__LOG_RETENTION_DAYS"
         )
-        assert jmespath.search("spec.template.spec.containers[1].env[0].value", docs[0]) == "15"
+        assert docs[0]["spec"]["template"]["spec"]["containers"][1]["env"][0]["value"] == "15"
 
     def test_log_groomer_collector_custom_env(self):
         env = [
@@ -104,19 +97,18 @@ class LogGroomerTestBase:
                 "triggerer": {"logGroomerSidecar": {"env": env}},
             }
 
-        docs = render_chart(
-            values=values, show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"]
-        )
+        docs = render_chart(values=values, show_only=self.deployment_template)
 
-        assert {"name": "APP_RELEASE_NAME", "value": "release-name-airflow"} in jmespath.search(
-            "spec.template.spec.containers[1].env", docs[0]
-        )
-        assert {"name": "APP__LOG_RETENTION_DAYS", "value": "5"} in jmespath.search(
-            "spec.template.spec.containers[1].env", docs[0]
-        )
+        actual_env = docs[0]["spec"]["template"]["spec"]["containers"][1]["env"]
+        assert {"name": "APP_RELEASE_NAME", "value": "release-name-airflow"} in actual_env
+        assert {"name": "APP__LOG_RETENTION_DAYS", "value": "5"} in actual_env
 
-    @pytest.mark.parametrize("command", [None, ["custom", "command"]])
-    @pytest.mark.parametrize("args", [None, ["custom", "args"]])
+    # Each case sets one key and unsets the other, so two renders cover the set and unset state of both
+    # keys and also catch either key being rendered only when the other one is set
+    @pytest.mark.parametrize(
+        "command, args",
+        [(["custom", "command"], None), (None, ["custom", "args"])],
+    )
     def test_log_groomer_command_and_args_overrides(self, command, args):
         if self.obj_name == "dag-processor":
             values = {
@@ -130,11 +122,11 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
-        assert command == jmespath.search("spec.template.spec.containers[1].command", docs[0])
-        assert args == jmespath.search("spec.template.spec.containers[1].args", docs[0])
+        assert command == _search("spec.template.spec.containers[1].command", docs[0])
+        assert args == _search("spec.template.spec.containers[1].args", docs[0])
 
     def test_log_groomer_command_and_args_overrides_are_templated(self):
         if self.obj_name == "dag-processor":
@@ -159,11 +151,11 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
-        assert jmespath.search("spec.template.spec.containers[1].command", docs[0]) == ["release-name"]
-        assert jmespath.search("spec.template.spec.containers[1].args", docs[0]) == ["Helm"]
+        assert docs[0]["spec"]["template"]["spec"]["containers"][1]["command"] == ["release-name"]
+        assert docs[0]["spec"]["template"]["spec"]["containers"][1]["args"] == ["Helm"]
 
     @pytest.mark.parametrize("retention_days, retention_result", [(None, None), (30, "30")])
     def test_log_groomer_retention_days_overrides(self, retention_days, retention_result):
@@ -176,19 +168,19 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
         if retention_result:
             assert (
-                jmespath.search(
+                _search(
                     "spec.template.spec.containers[1].env[?name=='AIRFLOW__LOG_RETENTION_DAYS'].value | [0]",
                     docs[0],
                 )
                 == retention_result
             )
         else:
-            assert len(jmespath.search("spec.template.spec.containers[1].env", docs[0])) == 2
+            assert len(docs[0]["spec"]["template"]["spec"]["containers"][1]["env"]) == 2
 
     @pytest.mark.parametrize("frequency_minutes, frequency_result", [(None, None), (20, "20")])
     def test_log_groomer_frequency_minutes_overrides(self, frequency_minutes, frequency_result):
@@ -204,19 +196,19 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
         if frequency_result:
             assert (
-                jmespath.search(
+                _search(
                     "spec.template.spec.containers[1].env[?name=='AIRFLOW__LOG_CLEANUP_FREQUENCY_MINUTES'].value | [0]",
                     docs[0],
                 )
                 == frequency_result
             )
         else:
-            assert len(jmespath.search("spec.template.spec.containers[1].env", docs[0])) == 2
+            assert len(docs[0]["spec"]["template"]["spec"]["containers"][1]["env"]) == 2
 
     def test_log_groomer_resources(self):
         if self.obj_name == "dag-processor":
@@ -245,10 +237,10 @@ class LogGroomerTestBase:
 
         docs = render_chart(
             values=values,
-            show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"],
+            show_only=self.deployment_template,
         )
 
-        assert jmespath.search("spec.template.spec.containers[1].resources", docs[0]) == {
+        assert docs[0]["spec"]["template"]["spec"]["containers"][1]["resources"] == {
             "limits": {
                 "cpu": "2",
                 "memory": "3Gi",
@@ -259,17 +251,10 @@ class LogGroomerTestBase:
             },
         }
 
-    def test_log_groomer_has_airflow_home(self):
-        if self.obj_name == "dag-processor":
-            values = {"dagProcessor": {"enabled": True}}
-        else:
-            values = None
-
-        docs = render_chart(
-            values=values, show_only=[f"templates/{self.folder}/{self.obj_name}-deployment.yaml"]
-        )
+    def test_log_groomer_has_airflow_home(self, default_deployment_docs):
+        docs = default_deployment_docs
 
         assert (
-            jmespath.search("spec.template.spec.containers[1].env[?name=='AIRFLOW_HOME'].name | [0]", docs[0])
+            _search("spec.template.spec.containers[1].env[?name=='AIRFLOW_HOME'].name | [0]", docs[0])
             == "AIRFLOW_HOME"
         )